@@ -5,46 +5,41 @@ import os
 import pathlib
 import sys
 import time
+from typing import TYPE_CHECKING, Optional
 
 from cltl.dialogue_act_classification.api import DialogueActClassifier
-from cltl.dialogue_act_classification.midas_classifier import MidasDialogTagger
-from cltl.dialogue_act_classification.silicone_classifier import SiliconeDialogueActClassifier
 from cltl.emotion_extraction.api import EmotionExtractor
-from cltl.emotion_extraction.utterance_go_emotion_extractor import GoEmotionDetector
-from cltl.emotion_extraction.utterance_vader_sentiment_extractor import VaderSentimentDetector
 from cltl.emotion_responder.api import EmotionResponder
-from cltl.emotion_responder.emotion_responder import EmotionResponderImpl
-from cltl_service.dialogue_act_classification.service import DialogueActClassificationService
-from cltl_service.emotion_extraction.service import EmotionExtractionService
-from cltl_service.emotion_responder.service import EmotionResponderService
 from flask import Flask
 from werkzeug.middleware.dispatcher import DispatcherMiddleware
 from werkzeug.serving import run_simple
 
-from cltl.brain.long_term_memory import LongTermMemory
 from cltl.chatui.api import Chats
-from cltl.chatui.memory import MemoryChats
 from cltl.combot.infra.config.k8config import K8LocalConfigurationContainer
 from cltl.combot.infra.di_container import singleton
 from cltl.combot.infra.event.memory import SynchronousEventBusContainer
 from cltl.combot.infra.event_log import LogWriter
 from cltl.combot.infra.resource.threaded import ThreadedResourceContainer
 from cltl.emissordata.api import EmissorDataStorage
-from cltl.emissordata.file_storage import EmissorDataFileStorage
-from cltl.reply_generation.thought_selectors.random_selector import RandomSelector
-from cltl.triple_extraction.api import DialogueAct
-from cltl.triple_extraction.chat_analyzer import ChatAnalyzer
-from cltl_service.brain.service import BrainService
-from cltl_service.chatui.service import ChatUiService
-from cltl_service.combot.event_log.service import EventLogService
-from cltl_service.emissordata.client import EmissorDataClient
-from cltl_service.emissordata.service import EmissorDataService
-from cltl_service.entity_linking.service import DisambiguationService
-from cltl_service.reply_generation.service import ReplyGenerationService
-from cltl_service.triple_extraction.service import TripleExtractionService
 from emissor.representation.util import serializer as emissor_serializer
+from myapp.profiling.startup import startup_profiler, IMPORT, LOAD, START
 from myapp_service.context.service import ContextService
 
+if TYPE_CHECKING:
+    from cltl.brain.long_term_memory import LongTermMemory
+    from cltl_service.brain.service import BrainService
+    from cltl_service.chatui.service import ChatUiService
+    from cltl_service.dialogue_act_classification.service import DialogueActClassificationService
+    from cltl_service.emissordata.client import EmissorDataClient
+    from cltl_service.emissordata.service import EmissorDataService
+    from cltl_service.emotion_extraction.service import EmotionExtractionService
+    from cltl_service.emotion_responder.service import EmotionResponderService
+    from cltl_service.entity_linking.service import DisambiguationService
+    from cltl_service.reply_generation.service import ReplyGenerationService
+    from cltl_service.triple_extraction.service import TripleExtractionService
+    from myapp.brain.rdf_log import RdfLogWriter
+    from myapp_service.chatui.service import ChatPushService
+
 #### Added imports
 
 logging.config.fileConfig(os.environ.get('CLTL_LOGGING_CONFIG', default='config/logging.config'),
@@ -60,23 +55,35 @@ class EmissorStorageContainer(InfraContainer):
     @property
     @singleton
     def emissor_storage(self) -> EmissorDataStorage:
-        return EmissorDataFileStorage.from_config(self.config_manager)
+        with startup_profiler.measure("Emissor Data Storage", IMPORT):
+            from cltl.emissordata.file_storage import EmissorDataFileStorage
+
+        with startup_profiler.measure("Emissor Data Storage", LOAD):
+            return EmissorDataFileStorage.from_config(self.config_manager)
 
     @property
     @singleton
-    def emissor_data_service(self) -> EmissorDataService:
-        return EmissorDataService.from_config(self.emissor_storage,
-                                              self.event_bus, self.resource_manager, self.config_manager)
+    def emissor_data_service(self) -> "EmissorDataService":
+        with startup_profiler.measure("Emissor Data Storage", IMPORT):
+            from cltl_service.emissordata.service import EmissorDataService
+
+        with startup_profiler.measure("Emissor Data Storage", LOAD):
+            return EmissorDataService.from_config(self.emissor_storage,
+                                                  self.event_bus, self.resource_manager, self.config_manager)
 
     @property
     @singleton
-    def emissor_data_client(self) -> EmissorDataClient:
+    def emissor_data_client(self) -> "EmissorDataClient":
+        with startup_profiler.measure("Emissor Data Storage", IMPORT):
+            from cltl_service.emissordata.client import EmissorDataClient
+
         return EmissorDataClient("http://0.0.0.0:8000/emissor")
 
     def start(self):
         logger.info("Start Emissor Data Storage")
         super().start()
-        self.emissor_data_service.start()
+        with startup_profiler.measure("Emissor Data Storage", START):
+            self.emissor_data_service.start()
 
     def stop(self):
         try:
@@ -90,21 +97,45 @@ class ChatUIContainer(InfraContainer):
     @property
     @singleton
     def chats(self) -> Chats:
-        return MemoryChats()
+        with startup_profiler.measure("Chat UI", IMPORT):
+            from myapp.chatui.bounded_chats import BoundedChats
+
+        config = self.config_manager.get_config("cltl.chat-ui")
+        max_history = config.get_int("max_history") if "max_history" in config else 200
+        idle_timeout = config.get_float("idle_timeout") if "idle_timeout" in config else 3600
+        spill_dir = config.get("spill_dir") if "spill_dir" in config else None
+
+        return BoundedChats(max_history=max_history, idle_timeout=idle_timeout,
+                            spill_dir=pathlib.Path(spill_dir) if spill_dir else None)
+
+    @property
+    @singleton
+    def chatui_service(self) -> "ChatUiService":
+        with startup_profiler.measure("Chat UI", IMPORT):
+            from cltl_service.chatui.service import ChatUiService
+
+        with startup_profiler.measure("Chat UI", LOAD):
+            return ChatUiService.from_config(self.chats, self.event_bus, self.resource_manager, self.config_manager)
 
     @property
     @singleton
-    def chatui_service(self) -> ChatUiService:
-        return ChatUiService.from_config(MemoryChats(), self.event_bus, self.resource_manager, self.config_manager)
+    def chat_push_service(self) -> "ChatPushService":
+        with startup_profiler.measure("Chat UI", IMPORT):
+            from myapp_service.chatui.service import ChatPushService
+
+        return ChatPushService.from_config(self.chats, self.config_manager)
 
     def start(self):
         logger.info("Start Chat UI")
         super().start()
-        self.chatui_service.start()
+        with startup_profiler.measure("Chat UI", START):
+            self.chatui_service.start()
+            self.chat_push_service.start()
 
     def stop(self):
         try:
             logger.info("Stop Chat UI")
+            self.chat_push_service.stop()
             self.chatui_service.stop()
         finally:
             super().stop()
@@ -120,10 +151,18 @@ class DialogueActClassficationContainer(InfraContainer):
         implementation = config.get("implementation")
 
         if implementation == "midas":
+            with startup_profiler.measure("Dialogue Act Classification", IMPORT):
+                from cltl.dialogue_act_classification.midas_classifier import MidasDialogTagger
+
             config = self.config_manager.get_config("cltl.dialogue_act_classification.midas")
-            return MidasDialogTagger(config.get("model"))
+            with startup_profiler.measure("Dialogue Act Classification", LOAD):
+                return MidasDialogTagger(config.get("model"))
         elif implementation == "silicone":
-            return SiliconeDialogueActClassifier()
+            with startup_profiler.measure("Dialogue Act Classification", IMPORT):
+                from cltl.dialogue_act_classification.silicone_classifier import SiliconeDialogueActClassifier
+
+            with startup_profiler.measure("Dialogue Act Classification", LOAD):
+                return SiliconeDialogueActClassifier()
         elif not implementation:
             logger.warning("No DialogueClassifier implementation configured")
             return False
@@ -132,8 +171,11 @@ class DialogueActClassficationContainer(InfraContainer):
 
     @property
     @singleton
-    def dialogue_act_classification_service(self) -> DialogueActClassificationService:
+    def dialogue_act_classification_service(self) -> "DialogueActClassificationService":
         if self.dialogue_act_classifier:
+            with startup_profiler.measure("Dialogue Act Classification", IMPORT):
+                from cltl_service.dialogue_act_classification.service import DialogueActClassificationService
+
             return DialogueActClassificationService.from_config(self.dialogue_act_classifier,
                                                                 self.event_bus, self.resource_manager,
                                                                 self.config_manager)
@@ -144,7 +186,8 @@ class DialogueActClassficationContainer(InfraContainer):
         super().start()
         if self.dialogue_act_classification_service:
             logger.info("Start Dialogue Act Classification Service")
-            self.dialogue_act_classification_service.start()
+            with startup_profiler.measure("Dialogue Act Classification", START):
+                self.dialogue_act_classification_service.start()
 
     def stop(self):
         if self.dialogue_act_classification_service:
@@ -161,10 +204,18 @@ class EmotionRecognitionContainer(InfraContainer):
         implementation = config.get("impl")
 
         if implementation == "Go":
+            with startup_profiler.measure("Emotion Recognition", IMPORT):
+                from cltl.emotion_extraction.utterance_go_emotion_extractor import GoEmotionDetector
+
             config = self.config_manager.get_config("cltl.emotion_recognition.go")
-            detector = GoEmotionDetector(config.get("model"))
+            with startup_profiler.measure("Emotion Recognition", LOAD):
+                detector = GoEmotionDetector(config.get("model"))
         elif implementation == "Vader":
-            detector = VaderSentimentDetector()
+            with startup_profiler.measure("Emotion Recognition", IMPORT):
+                from cltl.emotion_extraction.utterance_vader_sentiment_extractor import VaderSentimentDetector
+
+            with startup_profiler.measure("Emotion Recognition", LOAD):
+                detector = VaderSentimentDetector()
         elif not implementation:
             logger.warning("No EmotionExtractor implementation configured")
             detector = False
@@ -176,12 +227,18 @@ class EmotionRecognitionContainer(InfraContainer):
     @property
     @singleton
     def emotion_responder(self) -> EmotionResponder:
+        with startup_profiler.measure("Emotion Recognition", IMPORT):
+            from cltl.emotion_responder.emotion_responder import EmotionResponderImpl
+
         return EmotionResponderImpl()
 
     @property
     @singleton
-    def emotion_recognition_service(self) -> EmotionExtractionService:
+    def emotion_recognition_service(self) -> "EmotionExtractionService":
         if self.emotion_extractor:
+            with startup_profiler.measure("Emotion Recognition", IMPORT):
+                from cltl_service.emotion_extraction.service import EmotionExtractionService
+
             return EmotionExtractionService.from_config(self.emotion_extractor, self.event_bus,
                                                         self.resource_manager, self.config_manager)
         else:
@@ -189,7 +246,10 @@ class EmotionRecognitionContainer(InfraContainer):
 
     @property
     @singleton
-    def emotion_responder_service(self) -> EmotionResponderService:
+    def emotion_responder_service(self) -> "EmotionResponderService":
+        with startup_profiler.measure("Emotion Recognition", IMPORT):
+            from cltl_service.emotion_responder.service import EmotionResponderService
+
         return EmotionResponderService.from_config(self.emotion_responder, self.event_bus,
                                                    self.resource_manager, self.config_manager)
 
@@ -197,7 +257,8 @@ class EmotionRecognitionContainer(InfraContainer):
         super().start()
         if self.emotion_recognition_service:
             logger.info("Start Emotion Recognition service")
-            self.emotion_recognition_service.start()
+            with startup_profiler.measure("Emotion Recognition", START):
+                self.emotion_recognition_service.start()
 
     def stop(self):
         try:
@@ -236,40 +297,59 @@ class EmotionRecognitionContainer(InfraContainer):
 class TripleExtractionContainer(EmissorStorageContainer, InfraContainer):
     @property
     @singleton
-    def triple_extraction_service(self) -> TripleExtractionService:
+    def triple_extraction_service(self) -> "TripleExtractionService":
         config = self.config_manager.get_config("cltl.triple_extraction")
         implementation = config.get("implementation", multi=True)
         timeout = config.get_float("timeout") if "timeout" in config else 0.0
 
+        with startup_profiler.measure("Triple Extraction", IMPORT):
+            from cltl.triple_extraction.api import DialogueAct
+            from cltl.triple_extraction.chat_analyzer import ChatAnalyzer
+            from cltl_service.triple_extraction.service import TripleExtractionService
+
         analyzers = []
-        if "CFGAnalyzer" in implementation:
-            from cltl.triple_extraction.cfg_analyzer import CFGAnalyzer
-            analyzers.append(CFGAnalyzer(process_questions=False))
-        if "CFGQuestionAnalyzer" in implementation:
-            from cltl.question_extraction.cfg_question_analyzer import CFGQuestionAnalyzer
-            analyzers.append(CFGQuestionAnalyzer())
-        if "StanzaQuestionAnalyzer" in implementation:
-            from cltl.question_extraction.stanza_question_analyzer import StanzaQuestionAnalyzer
-            analyzers.append(StanzaQuestionAnalyzer())
-        if "OIEAnalyzer" in implementation:
-            from cltl.triple_extraction.oie_analyzer import OIEAnalyzer
-            analyzers.append(OIEAnalyzer())
-        if "SpacyAnalyzer" in implementation:
-            from cltl.triple_extraction.spacy_analyzer import spacyAnalyzer
-            analyzers.append(spacyAnalyzer())
-        if "ConversationalAnalyzer" in implementation:
-            from cltl.triple_extraction.conversational_analyzer import ConversationalAnalyzer
-            config = self.config_manager.get_config('cltl.triple_extraction.conversational')
-            model_path = config.get('model_path')
-            base_model = config.get('base_model')
-            language = config.get("language")
-            threshold = config.get_float("threshold")
-            max_triples = config.get_int("max_triples")
-            batch_size = config.get_int("batch_size")
-            dialogue_acts = [DialogueAct.STATEMENT]
-            analyzers.append(ConversationalAnalyzer(model_path=model_path, base_model=base_model, threshold=threshold,
-                                                    max_triples=max_triples, batch_size=batch_size,
-                                                    dialogue_acts=dialogue_acts, lang=language))
+        with startup_profiler.measure("Triple Extraction", LOAD):
+            if "CFGAnalyzer" in implementation:
+                with startup_profiler.measure("Triple Extraction", IMPORT):
+                    from cltl.triple_extraction.cfg_analyzer import CFGAnalyzer
+                analyzers.append(CFGAnalyzer(process_questions=False))
+            if "CFGQuestionAnalyzer" in implementation:
+                with startup_profiler.measure("Triple Extraction", IMPORT):
+                    from cltl.question_extraction.cfg_question_analyzer import CFGQuestionAnalyzer
+                analyzers.append(CFGQuestionAnalyzer())
+            if "StanzaQuestionAnalyzer" in implementation:
+                with startup_profiler.measure("Triple Extraction", IMPORT):
+                    from cltl.question_extraction.stanza_question_analyzer import StanzaQuestionAnalyzer
+                analyzers.append(StanzaQuestionAnalyzer())
+            if "OIEAnalyzer" in implementation:
+                with startup_profiler.measure("Triple Extraction", IMPORT):
+                    from cltl.triple_extraction.oie_analyzer import OIEAnalyzer
+                analyzers.append(OIEAnalyzer())
+            if "SpacyAnalyzer" in implementation:
+                with startup_profiler.measure("Triple Extraction", IMPORT):
+                    from cltl.triple_extraction.spacy_analyzer import spacyAnalyzer
+                analyzers.append(spacyAnalyzer())
+            if "ConversationalAnalyzer" in implementation:
+                with startup_profiler.measure("Triple Extraction", IMPORT):
+                    from cltl.triple_extraction.conversational_analyzer import ConversationalAnalyzer
+                config = self.config_manager.get_config('cltl.triple_extraction.conversational')
+                model_path = config.get('model_path')
+                base_model = config.get('base_model')
+                language = config.get("language")
+                threshold = config.get_float("threshold")
+                max_triples = config.get_int("max_triples")
+                batch_size = config.get_int("batch_size")
+                dialogue_acts = [DialogueAct.STATEMENT]
+                if "cache_context" in config and config.get_boolean("cache_context"):
+                    with startup_profiler.measure("Triple Extraction", IMPORT):
+                        from myapp.triple_extraction.caching_analyzer import CachingConversationalAnalyzer
+                    analyzer_class = CachingConversationalAnalyzer
+                else:
+                    analyzer_class = ConversationalAnalyzer
+                analyzers.append(analyzer_class(model_path=model_path, base_model=base_model,
+                                                threshold=threshold, max_triples=max_triples,
+                                                batch_size=batch_size, dialogue_acts=dialogue_acts,
+                                                lang=language))
 
         if not analyzers:
             raise ValueError("No supported analyzers in " + implementation)
@@ -283,7 +363,8 @@ class TripleExtractionContainer(EmissorStorageContainer, InfraContainer):
     def start(self):
         logger.info("Start Triple Extraction")
         super().start()
-        self.triple_extraction_service.start()
+        with startup_profiler.measure("Triple Extraction", START):
+            self.triple_extraction_service.start()
 
     def stop(self):
         try:
@@ -296,31 +377,112 @@ class TripleExtractionContainer(EmissorStorageContainer, InfraContainer):
 class BrainContainer(InfraContainer):
     @property
     @singleton
-    def brain(self) -> LongTermMemory:
+    def rdf_log_writer(self) -> Optional["RdfLogWriter"]:
+        config = self.config_manager.get_config("cltl.brain")
+        rdf_log = config.get("rdf_log") if "rdf_log" in config else None
+
+        if not rdf_log or rdf_log == "sync":
+            return None
+        elif rdf_log != "async":
+            raise ValueError("Unsupported RDF log: " + rdf_log)
+
+        with startup_profiler.measure("Brain", IMPORT):
+            from myapp.brain.rdf_log import RdfLogWriter, log_brain_updates
+
+        log_dir = pathlib.Path(config.get("log_dir"))
+        config = self.config_manager.get_config("cltl.brain.rdf_log")
+        writer = RdfLogWriter(log_dir,
+                              compression=config.get("compression"),
+                              segment_size=config.get_int("segment_size"),
+                              flush_interval=config.get_float("flush_interval"))
+        writer.start()
+
+        # Shared by all brain clients, including the entity linkers
+        log_brain_updates(writer)
+        logger.info("Writing RDF log asynchronously to %s", log_dir)
+
+        return writer
+
+    @property
+    @singleton
+    def brain(self) -> "LongTermMemory":
+        # Make sure the RDF log is set up before the brain writes the ontology
+        _ = self.rdf_log_writer
+
         config = self.config_manager.get_config("cltl.brain")
         brain_address = config.get("address")
+        self._setup_triple_store(brain_address)
         brain_log_dir = config.get("log_dir")
         clear_brain = bool(config.get_boolean("clear_brain"))
+        lazy_thoughts = config.get_boolean("lazy_thoughts") if "lazy_thoughts" in config else False
+
+        thought_priority = []
+        if lazy_thoughts:
+            reply_config = self.config_manager.get_config("cltl.reply_generation")
+            implementations = reply_config.get("implementations", multi=True)
+            randomness = self._thought_randomness()
+            if implementations != ["LenkaReplier"]:
+                logger.info("Only the LenkaReplier selects thoughts in priority order, computing all thoughts in the "
+                            "brain for %s", implementations)
+            elif randomness > 0:
+                logger.info("Replies select random thoughts (randomness %s), computing all thoughts in the brain",
+                            randomness)
+            elif "thought_options" in reply_config:
+                thought_priority = reply_config.get("thought_options", multi=True)
+
+        if thought_priority:
+            with startup_profiler.measure("Brain", IMPORT):
+                from myapp.brain.lazy_thoughts import LazyThoughtsMemory
+
+            logger.info("Computing thoughts in the brain on demand in order %s", thought_priority)
+
+            with startup_profiler.measure("Brain", LOAD):
+                return LazyThoughtsMemory(address=brain_address,
+                                          log_dir=pathlib.Path(brain_log_dir),
+                                          clear_all=clear_brain,
+                                          thought_priority=thought_priority)
+
+        with startup_profiler.measure("Brain", IMPORT):
+            from cltl.brain.long_term_memory import LongTermMemory
 
         # TODO figure out how to put the brain RDF files in the EMISSOR scenario folder
-        return LongTermMemory(address=brain_address,
-                              log_dir=pathlib.Path(brain_log_dir),
-                              clear_all=clear_brain)
+        with startup_profiler.measure("Brain", LOAD):
+            return LongTermMemory(address=brain_address,
+                                  log_dir=pathlib.Path(brain_log_dir),
+                                  clear_all=clear_brain)
+
+    def _thought_randomness(self) -> float:
+        config = self.config_manager.get_config("cltl.reply_generation")
+
+        return config.get_float("randomness") if "randomness" in config else 1.0
+
+    def _setup_triple_store(self, address: str):
+        if address.startswith("embedded:"):
+            with startup_profiler.measure("Brain", IMPORT):
+                from myapp.brain.embedded_store import use_embedded_store
+
+            use_embedded_store()
 
     @property
     @singleton
-    def brain_service(self) -> BrainService:
+    def brain_service(self) -> "BrainService":
+        with startup_profiler.measure("Brain", IMPORT):
+            from cltl_service.brain.service import BrainService
+
         return BrainService.from_config(self.brain, self.event_bus, self.resource_manager, self.config_manager)
 
     def start(self):
         logger.info("Start Brain")
         super().start()
-        self.brain_service.start()
+        with startup_profiler.measure("Brain", START):
+            self.brain_service.start()
 
     def stop(self):
         try:
             logger.info("Stop Brain")
             self.brain_service.stop()
+            if self.rdf_log_writer:
+                self.rdf_log_writer.stop()
         finally:
             super().stop()
 
@@ -328,30 +490,41 @@ class BrainContainer(InfraContainer):
 class DisambiguationContainer(BrainContainer, InfraContainer):
     @property
     @singleton
-    def disambiguation_service(self) -> DisambiguationService:
+    def disambiguation_service(self) -> "DisambiguationService":
         config = self.config_manager.get_config("cltl.entity_linking")
         implementations = config.get("implementations")
         brain_address = config.get("address")
         brain_log_dir = config.get("log_dir")
         linkers = []
 
-        if "NamedEntityLinker" in implementations:
-            from cltl.entity_linking.linkers import NamedEntityLinker
-            linker = NamedEntityLinker(address=brain_address,
+        # Make sure the linkers use the shared RDF log
+        _ = self.rdf_log_writer
+        self._setup_triple_store(brain_address)
+
+        with startup_profiler.measure("Disambiguation", IMPORT):
+            from cltl_service.entity_linking.service import DisambiguationService
+
+        with startup_profiler.measure("Disambiguation", LOAD):
+            if "NamedEntityLinker" in implementations:
+                with startup_profiler.measure("Disambiguation", IMPORT):
+                    from cltl.entity_linking.linkers import NamedEntityLinker
+                linker = NamedEntityLinker(address=brain_address,
+                                           log_dir=pathlib.Path(brain_log_dir))
+                linkers.append(linker)
+            if "FaceIDLinker" in implementations:
+                with startup_profiler.measure("Disambiguation", IMPORT):
+                    from cltl.entity_linking.face_linker import FaceIDLinker
+                linker = FaceIDLinker(address=brain_address,
+                                      log_dir=pathlib.Path(brain_log_dir))
+                linkers.append(linker)
+            if "PronounLinker" in implementations:
+                # TODO This is OK here, we need to see how this will work in a containerized setting
+                # from cltl.reply_generation.rl_replier import PronounLinker
+                with startup_profiler.measure("Disambiguation", IMPORT):
+                    from cltl.entity_linking.linkers import PronounLinker
+                linker = PronounLinker(address=brain_address,
                                        log_dir=pathlib.Path(brain_log_dir))
-            linkers.append(linker)
-        if "FaceIDLinker" in implementations:
-            from cltl.entity_linking.face_linker import FaceIDLinker
-            linker = FaceIDLinker(address=brain_address,
-                                  log_dir=pathlib.Path(brain_log_dir))
-            linkers.append(linker)
-        if "PronounLinker" in implementations:
-            # TODO This is OK here, we need to see how this will work in a containerized setting
-            # from cltl.reply_generation.rl_replier import PronounLinker
-            from cltl.entity_linking.linkers import PronounLinker
-            linker = PronounLinker(address=brain_address,
-                                   log_dir=pathlib.Path(brain_log_dir))
-            linkers.append(linker)
+                linkers.append(linker)
         if not linkers:
             raise ValueError("Unsupported implementation " + implementations)
 
@@ -363,7 +536,8 @@ class DisambiguationContainer(BrainContainer, InfraContainer):
     def start(self):
         logger.info("Start Disambigution Service")
         super().start()
-        self.disambiguation_service.start()
+        with startup_profiler.measure("Disambiguation", START):
+            self.disambiguation_service.start()
 
     def stop(self):
         try:
@@ -376,37 +550,46 @@ class DisambiguationContainer(BrainContainer, InfraContainer):
 class ReplierContainer(BrainContainer, EmissorStorageContainer, InfraContainer):
     @property
     @singleton
-    def reply_service(self) -> ReplyGenerationService:
+    def reply_service(self) -> "ReplyGenerationService":
         config = self.config_manager.get_config("cltl.reply_generation")
         implementations = config.get("implementations")
         repliers = []
 
-        if "LenkaReplier" in implementations:
-            from cltl.reply_generation.lenka_replier import LenkaReplier
-            thought_options = config.get("thought_options", multi=True) if "thought_options" in config else []
-            llamalize = config.get("llamalize") if "llamalize" in config else False
-            model = config.get("model") if "model" in config else None
-            instruct = config.get("instruct") if "instruct" in config else None
-            temperature = config.get("temperature") if "temperature" in config else None
-            max_tokens = config.get("max_tokens") if "max_tokens" in config else None
-            show_lenka = config.get("show_lenka") if "show_lenka" in config else False
-            randomness = float(config.get("randomness")) if "randomness" in config else 1.0
-            replier = LenkaReplier(model=model, instruct=instruct, llamalize=llamalize, temperature=float(temperature), max_tokens=int(max_tokens), show_lenka=show_lenka, thought_selector=RandomSelector(randomness=randomness, priority=thought_options))
-            repliers.append(replier)
-        if "RLReplier" in implementations:
-            from cltl.reply_generation.rl_replier import RLReplier
-            # TODO This is OK here, we need to see how this will work in a containerized setting
-            replier = RLReplier(self.brain)
-            repliers.append(replier)
-        if "LlamaReplier" in implementations:
-            from cltl.reply_generation.llama_replier import LlamaReplier
-            replier = LlamaReplier()
-            repliers.append(replier)
-        if "SimpleNLGReplier" in implementations:
-            from cltl.reply_generation.simplenlg_replier import SimpleNLGReplier
-            # TODO This is OK here, we need to see how this will work in a containerized setting
-            replier = SimpleNLGReplier()
-            repliers.append(replier)
+        with startup_profiler.measure("Repliers", IMPORT):
+            from cltl_service.reply_generation.service import ReplyGenerationService
+
+        with startup_profiler.measure("Repliers", LOAD):
+            if "LenkaReplier" in implementations:
+                with startup_profiler.measure("Repliers", IMPORT):
+                    from cltl.reply_generation.lenka_replier import LenkaReplier
+                    from cltl.reply_generation.thought_selectors.random_selector import RandomSelector
+                thought_options = config.get("thought_options", multi=True) if "thought_options" in config else []
+                llamalize = config.get("llamalize") if "llamalize" in config else False
+                model = config.get("model") if "model" in config else None
+                instruct = config.get("instruct") if "instruct" in config else None
+                temperature = config.get("temperature") if "temperature" in config else None
+                max_tokens = config.get("max_tokens") if "max_tokens" in config else None
+                show_lenka = config.get("show_lenka") if "show_lenka" in config else False
+                randomness = self._thought_randomness()
+                replier = LenkaReplier(model=model, instruct=instruct, llamalize=llamalize, temperature=float(temperature), max_tokens=int(max_tokens), show_lenka=show_lenka, thought_selector=RandomSelector(randomness=randomness, priority=thought_options))
+                repliers.append(replier)
+            if "RLReplier" in implementations:
+                with startup_profiler.measure("Repliers", IMPORT):
+                    from cltl.reply_generation.rl_replier import RLReplier
+                # TODO This is OK here, we need to see how this will work in a containerized setting
+                replier = RLReplier(self.brain)
+                repliers.append(replier)
+            if "LlamaReplier" in implementations:
+                with startup_profiler.measure("Repliers", IMPORT):
+                    from cltl.reply_generation.llama_replier import LlamaReplier
+                replier = LlamaReplier()
+                repliers.append(replier)
+            if "SimpleNLGReplier" in implementations:
+                with startup_profiler.measure("Repliers", IMPORT):
+                    from cltl.reply_generation.simplenlg_replier import SimpleNLGReplier
+                # TODO This is OK here, we need to see how this will work in a containerized setting
+                replier = SimpleNLGReplier()
+                repliers.append(replier)
         if not repliers:
             raise ValueError("Unsupported implementation " + implementations)
 
@@ -416,7 +599,8 @@ class ReplierContainer(BrainContainer, EmissorStorageContainer, InfraContainer):
     def start(self):
         logger.info("Start Repliers")
         super().start()
-        self.reply_service.start()
+        with startup_profiler.measure("Repliers", START):
+            self.reply_service.start()
 
     def stop(self):
         try:
@@ -464,7 +648,8 @@ class ContextContainer(InfraContainer):
     def start(self):
         logger.info("Start Context Service")
         super().start()
-        self.context_service.start()
+        with startup_profiler.measure("Context", START):
+            self.context_service.start()
 
     def stop(self):
         logger.info("Stop Context Service")
@@ -494,12 +679,16 @@ class ApplicationContainer(ChatUIContainer,
     @property
     @singleton
     def event_log_service(self):
+        with startup_profiler.measure("Event Log", IMPORT):
+            from cltl_service.combot.event_log.service import EventLogService
+
         return EventLogService.from_config(self.log_writer, self.event_bus, self.config_manager)
 
     def start(self):
         logger.info("Start EventLog")
         super().start()
-        self.event_log_service.start()
+        with startup_profiler.measure("Event Log", START):
+            self.event_log_service.start()
         self.context_service.start_scenario()
 
     def stop(self):
@@ -522,13 +711,26 @@ def serializer(obj):
             return str(obj)
 
 def main():
+    parser = argparse.ArgumentParser(description='Text-eKG-Text app')
+    parser.add_argument('--profile-startup', action='store_true',
+                        help="Report import, model load and service start times per container and exit")
+    args, _ = parser.parse_known_args()
+
+    if args.profile_startup:
+        startup_profiler.enable()
+
     ApplicationContainer.load_configuration()
     logger.info("Initialized Application")
     application = ApplicationContainer()
     with application as started_app:
+        if args.profile_startup:
+            logger.info("Startup times (s):\n%s", startup_profiler.report())
+            return
+
         routes = {
             '/emissor': started_app.emissor_data_service.app,
             '/chatui': started_app.chatui_service.app,
+            '/chatui/push': started_app.chat_push_service.app,
         }
 
         web_app = DispatcherMiddleware(Flask("Text-eKG-Text app"), routes)
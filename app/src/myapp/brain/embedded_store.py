@@ -0,0 +1,155 @@
+import logging
+import pathlib
+import threading
+from typing import Dict
+
+from pyoxigraph import BlankNode, Literal, NamedNode, RdfFormat, Store
+
+logger = logging.getLogger(__name__)
+
+
+EMBEDDED_PREFIX = "embedded:"
+
+_FORMATS = {
+    "trig": RdfFormat.TRIG,
+    "nquads": RdfFormat.N_QUADS,
+    "turtle": RdfFormat.TURTLE,
+    "nt": RdfFormat.N_TRIPLES,
+}
+
+_PLAIN_DATATYPES = ("http://www.w3.org/2001/XMLSchema#string",
+                    "http://www.w3.org/1999/02/22-rdf-syntax-ns#langString")
+
+_stores: Dict[str, Store] = {}
+_stores_lock = threading.Lock()
+
+
+def is_embedded(address: str) -> bool:
+    return address.startswith(EMBEDDED_PREFIX)
+
+
+def _get_store(address: str) -> Store:
+    location = address[len(EMBEDDED_PREFIX):].strip()
+
+    with _stores_lock:
+        key = str(pathlib.Path(location).resolve()) if location else ""
+        if key not in _stores:
+            if location:
+                pathlib.Path(location).mkdir(parents=True, exist_ok=True)
+                _stores[key] = Store(location)
+                logger.info("Opened embedded triple store at %s", location)
+            else:
+                _stores[key] = Store()
+                logger.info("Created in-memory embedded triple store")
+
+        return _stores[key]
+
+
+def _to_json(term) -> dict:
+    if isinstance(term, NamedNode):
+        return {'type': 'uri', 'value': term.value}
+    elif isinstance(term, BlankNode):
+        return {'type': 'bnode', 'value': term.value}
+    elif isinstance(term, Literal):
+        binding = {'type': 'literal', 'value': term.value}
+        if term.language:
+            binding['xml:lang'] = term.language
+        elif term.datatype.value not in _PLAIN_DATATYPES:
+            binding['datatype'] = term.datatype.value
+
+        return binding
+
+    raise ValueError(f"Unsupported term in query result: {term!r}")
+
+
+class EmbeddedStoreConnector(object):
+    """
+    Drop-in replacement for :class:`cltl.brain.infrastructure.StoreConnector` that runs the triple store in process.
+
+    The store is an Oxigraph store, persisted in the directory given in the address (`embedded:<path>`), or kept in
+    memory if no path is given. Connectors with the same address share the same store. As in GraphDB, the default
+    graph of queries is the union of all named graphs. Unlike GraphDB, no inference is done, queries only return the
+    explicit statements in the store.
+    """
+    def __init__(self, address, format):
+        # type: (str, str) -> EmbeddedStoreConnector
+        if not is_embedded(address):
+            raise ValueError(f"Not an embedded triple store address: {address}, expected {EMBEDDED_PREFIX}<path>")
+        if format not in _FORMATS:
+            raise ValueError(f"Unsupported format {format}, expected one of {list(_FORMATS)}")
+
+        self.address = address
+        self.format = format
+
+        self._store = _get_store(address)
+
+    def upload(self, data):
+        """
+        Add data to the brain
+        :param data: serialized data as string
+        :return: response status
+        """
+        self._store.load(input=data, format=_FORMATS[self.format])
+
+        return "204"
+
+    def query(self, query, ask=False, post=False):
+        """
+        Execute a SPARQL query on the triple store, and return the results as in the SPARQL JSON format
+        Parameters
+        ----------
+        query: str SPARQL query
+        ask: Boolean whether the query returns a Boolean
+        post: Boolean whether the query is an update instead of a query
+
+        Returns
+        -------
+        response: dictionary query results from triple store
+
+        """
+        if post:
+            self._store.update(query)
+            return None
+
+        result = self._store.query(query, use_default_graph_as_union=True)
+
+        if ask:
+            return bool(result)
+
+        variables = [variable.value for variable in result.variables]
+
+        return [{variable: _to_json(solution[variable]) for variable in variables if solution[variable] is not None}
+                for solution in result]
+
+    def export_repository(self):
+        """
+        Export all data in the brain
+        :param
+        :return: data in repository, as trig
+        """
+        return self._store.dump(format=RdfFormat.TRIG).decode("utf-8")
+
+
+def connect(address, format):
+    """
+    Create a connector for the triple store at the given address, either an embedded or a remote store.
+    """
+    if is_embedded(address):
+        return EmbeddedStoreConnector(address, format)
+
+    from cltl.brain.infrastructure import StoreConnector
+
+    return StoreConnector(address, format)
+
+
+def use_embedded_store():
+    """
+    Let the brain clients connect to an embedded triple store if their address is `embedded:<path>`.
+
+    All brain clients (LongTermMemory, its reasoners and the entity linkers) create their connection in
+    `BasicBrain`. This replaces the connector used there with one that supports both embedded and remote triple
+    stores. Needs to be called before the brain clients are created.
+    """
+    import cltl.brain.basic_brain
+
+    cltl.brain.basic_brain.StoreConnector = connect
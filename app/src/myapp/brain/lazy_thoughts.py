@@ -0,0 +1,140 @@
+import logging
+import pathlib
+from typing import List, Optional
+
+from cltl.brain.LTM_shared import _create_actor
+from cltl.brain.LTM_statement_processing import process_statement
+from cltl.brain.infrastructure import Thoughts
+from cltl.brain.long_term_memory import LongTermMemory
+from cltl.commons.casefolding import casefold_text
+from cltl.commons.discrete import UtteranceType
+
+logger = logging.getLogger(__name__)
+
+
+STATEMENT_NOVELTY = "_statement_novelty"
+ENTITY_NOVELTY = "_entity_novelty"
+NEGATION_CONFLICTS = "_negation_conflicts"
+COMPLEMENT_CONFLICT = "_complement_conflict"
+SUBJECT_GAPS = "_subject_gaps"
+COMPLEMENT_GAPS = "_complement_gaps"
+OVERLAPS = "_overlaps"
+TRUST = "_trust"
+
+THOUGHT_TYPES = (STATEMENT_NOVELTY, ENTITY_NOVELTY, NEGATION_CONFLICTS, COMPLEMENT_CONFLICT,
+                 SUBJECT_GAPS, COMPLEMENT_GAPS, OVERLAPS, TRUST)
+
+# Thoughts that describe the state of the brain before the statement is uploaded
+_BEFORE_UPLOAD = (STATEMENT_NOVELTY, ENTITY_NOVELTY, OVERLAPS)
+
+
+class LazyThoughtsMemory(LongTermMemory):
+    """
+    LongTermMemory that only computes the thoughts needed to respond to a statement.
+
+    Thoughts are computed in the order of the given priority, as used by the thought selector of the replier, until a
+    thought with content is found. Thoughts that are not computed are left empty (None) in the brain response, this is
+    only suitable for repliers that select thoughts deterministically in this order, i.e. without randomness.
+    All thoughts are computed if no priority is given or if requested explicitly with `all_thoughts`.
+    """
+    def __init__(self, address: str, log_dir: pathlib.Path, clear_all: bool = False, calculate_trust: bool = False,
+                 thought_priority: Optional[List[str]] = None):
+        super(LazyThoughtsMemory, self).__init__(address, log_dir, clear_all, calculate_trust)
+
+        unknown = set(thought_priority or []) - set(THOUGHT_TYPES)
+        if unknown:
+            raise ValueError(f"Unsupported thought types {unknown}, expected one of {THOUGHT_TYPES}")
+
+        self._thought_priority = list(thought_priority) if thought_priority else []
+
+    def capsule_statement(self, capsule, reason_types=False, return_thoughts=True, create_label=False,
+                          all_thoughts=False):
+        if not return_thoughts or all_thoughts or not self._thought_priority:
+            return super(LazyThoughtsMemory, self).capsule_statement(capsule, reason_types=reason_types,
+                                                                     return_thoughts=return_thoughts,
+                                                                     create_label=create_label)
+
+        # Try to figure out what this entity is
+        if reason_types:
+            if not capsule['subject']['type'] or capsule['subject']['type'] == '':
+                subject_type, _ = self.type_reasoner.reason_entity_type(capsule['subject']['label'], exact_only=True)
+                capsule['subject']['type'] = [subject_type]
+
+            if not capsule['object']['type'] or capsule['object']['type'] == '':
+                object_type, _ = self.type_reasoner.reason_entity_type(capsule['object']['label'], exact_only=True)
+                capsule['object']['type'] = [object_type]
+
+        # Process capsule to right types
+        capsule['triple'] = self._rdf_builder.fill_triple(capsule['subject'], capsule['predicate'], capsule['object'])
+        capsule['perspective'] = self._rdf_builder.fill_perspective(capsule['perspective']) \
+            if 'perspective' in capsule.keys() else self._rdf_builder.fill_perspective({})
+        capsule['utterance_type'] = UtteranceType[capsule['utterance_type']] \
+            if type(capsule['utterance_type']) == str else capsule['utterance_type']
+
+        # Casefold
+        capsule['triple'].casefold(format='triple')
+        capsule['author']['type'] = [casefold_text(t, format='triple') for t in capsule['author']['type']]
+
+        # Create graphs and triples
+        claim = process_statement(self, capsule, create_label)
+
+        # Thoughts on the knowledge before the update, up to the first one that can be used
+        thoughts = {}
+        for thought_type in self._thought_priority:
+            if thought_type in _BEFORE_UPLOAD:
+                thoughts[thought_type] = self._compute_thought(thought_type, capsule, claim, create_label)
+                if self._has_content(thought_type, thoughts[thought_type]):
+                    break
+
+        # Finish process of uploading new knowledge to the triple store
+        rdf_log_path = self._brain_log()
+        data = self._serialize(rdf_log_path)
+        code = self._upload_to_brain(data)
+
+        # Remaining thoughts in order of priority, until one can be used
+        for thought_type in self._thought_priority:
+            if thought_type not in thoughts:
+                thoughts[thought_type] = self._compute_thought(thought_type, capsule, claim, create_label)
+            if self._has_content(thought_type, thoughts[thought_type]):
+                break
+
+        logger.debug("Computed thoughts %s for %s", list(thoughts.keys()), capsule['triple'])
+
+        # Create JSON output
+        thoughts = Thoughts(thoughts.get(STATEMENT_NOVELTY), thoughts.get(ENTITY_NOVELTY),
+                            thoughts.get(NEGATION_CONFLICTS), thoughts.get(COMPLEMENT_CONFLICT),
+                            thoughts.get(SUBJECT_GAPS), thoughts.get(COMPLEMENT_GAPS),
+                            thoughts.get(OVERLAPS), thoughts.get(TRUST))
+        output = {'response': code, 'statement': capsule, 'thoughts': thoughts, 'rdf_log_path': rdf_log_path}
+
+        return output
+
+    def _compute_thought(self, thought_type, capsule, claim, create_label):
+        triple = capsule['triple']
+
+        if thought_type == STATEMENT_NOVELTY:
+            return self.thought_generator.get_statement_novelty(claim.id)
+        elif thought_type == ENTITY_NOVELTY:
+            return self.thought_generator.fill_entity_novelty(triple.subject.id, triple.complement.id)
+        elif thought_type == OVERLAPS:
+            return self.thought_generator.get_overlaps(capsule)
+        elif thought_type == NEGATION_CONFLICTS:
+            return self.thought_generator.get_negation_conflicts(capsule)
+        elif thought_type == COMPLEMENT_CONFLICT:
+            return self.thought_generator.get_complement_cardinality_conflicts(capsule)
+        elif thought_type == SUBJECT_GAPS:
+            return self.thought_generator.get_entity_gaps(entity=triple.subject, exclude=triple.complement)
+        elif thought_type == COMPLEMENT_GAPS:
+            return self.thought_generator.get_entity_gaps(entity=triple.complement, exclude=triple.subject)
+        elif thought_type == TRUST:
+            actor, _ = _create_actor(self, capsule, create_label)
+            return self.trust_calculator.get_trust(actor.id)
+
+        raise ValueError("Unsupported thought type: " + thought_type)
+
+    @staticmethod
+    def _has_content(thought_type, thought):
+        if thought_type == TRUST:
+            return thought is not None
+
+        return bool(thought)
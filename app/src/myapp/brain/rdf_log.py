@@ -0,0 +1,347 @@
+import argparse
+import gzip
+import io
+import logging
+import pathlib
+import queue
+import threading
+import time
+from datetime import datetime
+from typing import Iterable, Iterator
+
+from rdflib import Dataset
+
+logger = logging.getLogger(__name__)
+
+
+NQUADS = "nquads"
+
+COMPRESSION_SUFFIXES = {
+    "gzip": ".nq.gz",
+    "zstd": ".nq.zst",
+}
+
+_STOP = object()
+_FLUSH = object()
+
+
+def _open_segment(path: pathlib.Path, mode: str):
+    if path.name.endswith(COMPRESSION_SUFFIXES["gzip"]):
+        return gzip.open(path, mode + "t", encoding="utf-8")
+    elif path.name.endswith(COMPRESSION_SUFFIXES["zstd"]):
+        import zstandard
+
+        if mode == "w":
+            stream = zstandard.ZstdCompressor().stream_writer(open(path, "wb"), closefd=True)
+        else:
+            stream = zstandard.ZstdDecompressor().stream_reader(open(path, "rb"), closefd=True)
+
+        return io.TextIOWrapper(stream, encoding="utf-8")
+
+    raise ValueError("Unsupported RDF log segment: " + path.name)
+
+
+def _truncation_errors(path: pathlib.Path) -> tuple:
+    if path.name.endswith(COMPRESSION_SUFFIXES["zstd"]):
+        import zstandard
+
+        return EOFError, zstandard.ZstdError
+
+    return EOFError,
+
+
+class RdfLogWriter:
+    """
+    Writes the RDF updates of the brain to N-Quads segments in a background thread.
+
+    Updates are queued by the brain clients and written in batches. A segment is closed and a new one is started once
+    it exceeds `segment_size` bytes of (uncompressed) N-Quads. Segments are compressed with gzip or zstd.
+    Written updates are flushed to disk at most `flush_interval` seconds later, also if no further updates arrive.
+    Updates appended after the writer is stopped are not written to the log.
+    """
+    def __init__(self, log_dir: pathlib.Path, compression: str = "gzip", segment_size: int = 64 * 1024 * 1024,
+                 flush_interval: float = 5.0):
+        if compression not in COMPRESSION_SUFFIXES:
+            raise ValueError(f"Unsupported compression {compression}, expected one of {list(COMPRESSION_SUFFIXES)}")
+        if compression == "zstd":
+            # Fail early if the optional dependency is missing
+            import zstandard
+
+        self._log_dir = log_dir
+        self._suffix = COMPRESSION_SUFFIXES[compression]
+        self._segment_size = segment_size
+        self._flush_interval = flush_interval
+
+        self._queue = queue.Queue()
+        self._thread = None
+        self._stopped = False
+        self._lock = threading.Lock()
+
+        self._segment = None
+        self._segment_bytes = 0
+        self._last_flush = 0.0
+        self._unflushed = False
+
+    def start(self):
+        if self._thread or self._stopped:
+            raise ValueError("RdfLogWriter already started")
+
+        self._log_dir.mkdir(parents=True, exist_ok=True)
+        self._thread = threading.Thread(target=self._run, name=self.__class__.__name__, daemon=True)
+        self._thread.start()
+        logger.info("Started RDF log in %s", self._log_dir)
+
+    def stop(self):
+        if not self._thread:
+            return
+
+        with self._lock:
+            self._stopped = True
+            self._queue.put(_STOP)
+        self._thread.join()
+        self._thread = None
+        logger.info("Stopped RDF log in %s", self._log_dir)
+
+    def append(self, data: str, format: str):
+        """
+        Queue serialized RDF data to be written to the log.
+
+        Parameters
+        ----------
+        data: str
+            The RDF data
+        format: str
+            The rdflib format of the data, e.g. trig
+        """
+        with self._lock:
+            if self._stopped:
+                logger.warning("RDF log in %s is stopped, dropped update of %s characters", self._log_dir, len(data))
+                return
+            if not self._thread:
+                raise ValueError("RdfLogWriter is not started")
+
+            self._queue.put((data, format))
+
+    def flush(self):
+        """
+        Wait until all queued updates are written and flushed to the log.
+        """
+        with self._lock:
+            if self._thread and not self._stopped:
+                self._queue.put(_FLUSH)
+        self._queue.join()
+
+    def _run(self):
+        try:
+            timeout = self._flush_interval if self._flush_interval > 0 else None
+            running = True
+            while running:
+                try:
+                    batch = [self._queue.get(timeout=timeout)]
+                except queue.Empty:
+                    self._flush()
+                    continue
+
+                while True:
+                    try:
+                        batch.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+
+                try:
+                    running = _STOP not in batch
+                    updates = [update for update in batch if update is not _STOP and update is not _FLUSH]
+                    if updates:
+                        self._write(updates)
+                    if not running or _FLUSH in batch:
+                        self._flush(force=True)
+                    elif self._queue.empty():
+                        self._flush()
+                except Exception:
+                    logger.exception("Failed to write RDF log (%s updates)", len(batch))
+                finally:
+                    for _ in batch:
+                        self._queue.task_done()
+        finally:
+            self._close_segment()
+
+    def _write(self, updates: Iterable[tuple]):
+        # Coalesce the updates, the brain may send the same statements repeatedly
+        dataset = Dataset()
+        for data, format in updates:
+            # Parse separately to skip only an invalid update, without partial content
+            update = Dataset()
+            try:
+                update.parse(data=data, format=format)
+            except Exception:
+                logger.exception("Skipped invalid RDF update in %s format: %.200s", format, data)
+                continue
+
+            for s, p, o, graph in update.quads():
+                dataset.graph(graph).add((s, p, o))
+
+        quads = dataset.serialize(format=NQUADS)
+        if not quads.strip():
+            return
+
+        if not self._segment:
+            self._open_segment()
+
+        self._segment.write(quads)
+        self._segment_bytes += len(quads)
+        self._unflushed = True
+
+        if self._segment_bytes >= self._segment_size:
+            self._close_segment()
+
+    def _flush(self, force: bool = False):
+        if not self._segment or not self._unflushed:
+            return
+
+        if force or time.monotonic() - self._last_flush >= self._flush_interval:
+            self._segment.flush()
+            self._last_flush = time.monotonic()
+            self._unflushed = False
+
+    def _open_segment(self):
+        path = self._log_dir / f"rdf_log_{datetime.now().strftime('%Y-%m-%d-%H-%M-%S-%f')}{self._suffix}"
+        self._segment = _open_segment(path, "w")
+        self._segment_bytes = 0
+        self._last_flush = time.monotonic()
+        self._unflushed = False
+        logger.debug("Opened RDF log segment %s", path)
+
+    def _close_segment(self):
+        if self._segment:
+            self._segment.close()
+            self._segment = None
+            self._segment_bytes = 0
+            self._unflushed = False
+
+
+def log_brain_updates(writer: RdfLogWriter):
+    """
+    Route the RDF snapshots of all brain clients to the given writer.
+
+    All brain clients (LongTermMemory, its reasoners and the entity linkers) store their updates through
+    `BasicBrain._serialize`, which by default writes a file for each update on the calling thread. This replaces it
+    to queue the update in the shared writer instead. Needs to be called before the brain clients are created.
+
+    As updates are no longer written to a file per update, the `rdf_log_path` in the responses of the brain is `None`
+    and the brain clients do not keep a log directory of their own.
+    """
+    from cltl.brain.basic_brain import BasicBrain
+
+    basic_brain_init = BasicBrain.__init__
+
+    def __init__(brain, address, log_dir, *args, **kwargs):
+        basic_brain_init(brain, address, log_dir, *args, **kwargs)
+
+        # Remove the (empty) directory for the files per update
+        try:
+            brain.log_dir.rmdir()
+        except OSError:
+            pass
+
+    def _brain_log(brain):
+        return None
+
+    def _serialize(brain, file_path):
+        data = brain.dataset.serialize(format=brain._connection.format)
+        writer.append(data, brain._connection.format)
+
+        # Clear local memory
+        brain.assign_local_memory()
+
+        return data
+
+    BasicBrain.__init__ = __init__
+    BasicBrain._brain_log = _brain_log
+    BasicBrain._serialize = _serialize
+
+
+def list_segments(log_dir: pathlib.Path) -> Iterable[pathlib.Path]:
+    suffixes = tuple(COMPRESSION_SUFFIXES.values())
+
+    return sorted(path for path in log_dir.rglob("rdf_log_*") if path.name.endswith(suffixes))
+
+
+def read_segments(log_dir: pathlib.Path) -> Iterator[str]:
+    """
+    Read the N-Quads from all segments in the log directory in the order they were written.
+
+    Segments that were not closed properly, e.g. when the application crashed, are read up to the last complete line.
+    """
+    for path in list_segments(log_dir):
+        line = None
+        try:
+            with _open_segment(path, "r") as segment:
+                for line in segment:
+                    # An incomplete last line can only be followed by the end of the stream
+                    if line.strip() and line.endswith("\n"):
+                        yield line
+        except _truncation_errors(path) as e:
+            logger.warning("RDF log segment %s is truncated, read up to the last complete line (%s)", path, e)
+
+        if line is not None and not line.endswith("\n"):
+            logger.warning("Skipped incomplete last line in RDF log segment %s", path)
+
+
+def replay(log_dir: pathlib.Path, connection, batch_size: int = 100000) -> int:
+    """
+    Upload the content of the RDF log to a triple store.
+
+    Parameters
+    ----------
+    log_dir: pathlib.Path
+        Directory containing the log segments
+    connection:
+        Connection to the triple store, e.g. a :class:`cltl.brain.infrastructure.StoreConnector`
+    batch_size: int
+        Number of quads to upload at once
+
+    Returns
+    -------
+    int
+        Number of quads read from the log
+    """
+    count = 0
+    batch = []
+    for line in read_segments(log_dir):
+        batch.append(line)
+        if len(batch) >= batch_size:
+            _upload(batch, connection)
+            count += len(batch)
+            batch = []
+
+    if batch:
+        _upload(batch, connection)
+        count += len(batch)
+
+    logger.info("Replayed %s quads from %s", count, log_dir)
+
+    return count
+
+
+def _upload(lines, connection):
+    dataset = Dataset()
+    dataset.parse(data="".join(lines), format=NQUADS)
+    connection.upload(dataset.serialize(format=connection.format))
+
+
+if __name__ == '__main__':
+    parser = argparse.ArgumentParser(description='Replay an RDF log into a triple store')
+    parser.add_argument('log_dir', type=str, help="Directory containing the RDF log segments")
+    parser.add_argument('address', type=str, help="Address of the triple store repository, e.g. "
+                                                  "http://localhost:7200/repositories/sandbox or embedded:./storage/graph")
+    parser.add_argument('--batch-size', type=int, required=False, default=100000, help="Quads uploaded at once")
+    args, _ = parser.parse_known_args()
+
+    logging.basicConfig(level=logging.INFO)
+
+    if args.address.startswith("embedded:"):
+        from myapp.brain.embedded_store import EmbeddedStoreConnector as StoreConnector
+    else:
+        from cltl.brain.infrastructure import StoreConnector
+
+    replay(pathlib.Path(args.log_dir), StoreConnector(args.address, format='trig'), args.batch_size)
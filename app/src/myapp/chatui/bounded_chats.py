@@ -0,0 +1,153 @@
+import dataclasses
+import json
+import logging
+import pathlib
+import threading
+import time
+from collections import deque
+from typing import Dict, List, Optional, Tuple
+
+from cltl.chatui.api import Chats, Utterance
+
+logger = logging.getLogger(__name__)
+
+
+@dataclasses.dataclass
+class _Chat:
+    offset: int
+    utterances: deque
+    last_access: float
+
+    @property
+    def length(self) -> int:
+        return self.offset + len(self.utterances)
+
+
+class BoundedChats(Chats):
+    """
+    In-memory chat store that keeps at most `max_history` utterances per chat and evicts idle chats.
+
+    Utterances that exceed the history limit, and chats that were idle for `idle_timeout` seconds, are written to
+    `spill_dir` if it is set, or dropped otherwise. Spilled utterances can still be retrieved from disk. Utterances
+    keep their sequence number in the chat when older utterances are dropped, also if the chat was evicted.
+    Clients can wait for new utterances in a chat with :meth:`wait_for_utterances`.
+    """
+    def __init__(self, max_history: int = 200, idle_timeout: float = 3600, spill_dir: Optional[pathlib.Path] = None):
+        if max_history < 1:
+            raise ValueError("max_history must be positive: " + str(max_history))
+
+        self._max_history = max_history
+        self._idle_timeout = idle_timeout
+        self._spill_dir = spill_dir
+        if self._spill_dir:
+            self._spill_dir.mkdir(parents=True, exist_ok=True)
+
+        self._chats: Dict[str, _Chat] = dict()
+        # Length of evicted chats whose utterances were dropped
+        self._evicted: Dict[str, int] = dict()
+        self._condition = threading.Condition()
+        self._last_eviction = time.monotonic()
+
+    def append(self, utterance: Utterance):
+        with self._condition:
+            chat = self._get_chat(utterance.chat_id)
+            chat.utterances.append(utterance)
+            chat.last_access = time.monotonic()
+
+            if len(chat.utterances) > self._max_history:
+                self._spill(utterance.chat_id, [chat.utterances.popleft()])
+                chat.offset += 1
+
+            self._evict_idle()
+            self._condition.notify_all()
+
+    def get_utterances(self, chat_id: str, from_sequence: int = 0) -> List[Utterance]:
+        with self._condition:
+            return self._get_utterances(chat_id, from_sequence)[1]
+
+    def wait_for_utterances(self, chat_id: str, from_sequence: int = 0,
+                            timeout: float = 30) -> Tuple[int, List[Utterance]]:
+        """
+        Get the utterances in the chat starting at `from_sequence`, waiting at most `timeout` seconds for new
+        utterances if there are none yet.
+
+        Returns
+        -------
+        Tuple[int, List[Utterance]]
+            The sequence number of the first returned utterance and the utterances. The sequence number is larger
+            than `from_sequence` if older utterances were dropped.
+        """
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            sequence, utterances = self._get_utterances(chat_id, from_sequence)
+            while not utterances:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._condition.wait(remaining)
+                sequence, utterances = self._get_utterances(chat_id, from_sequence)
+
+            return sequence, utterances
+
+    def _get_utterances(self, chat_id: str, from_sequence: int) -> Tuple[int, List[Utterance]]:
+        chat = self._get_chat(chat_id)
+        chat.last_access = time.monotonic()
+
+        from_sequence = max(from_sequence, 0)
+        if from_sequence >= chat.offset:
+            return from_sequence, list(chat.utterances)[from_sequence - chat.offset:]
+
+        spilled = self._read_spilled(chat_id)[from_sequence:chat.offset]
+        # Utterances that were dropped are skipped
+        start = chat.offset - len(spilled)
+
+        return start, spilled + list(chat.utterances)
+
+    def _get_chat(self, chat_id: str) -> _Chat:
+        if chat_id not in self._chats:
+            offset = self._count_spilled(chat_id) if self._spill_dir else self._evicted.pop(chat_id, 0)
+            self._chats[chat_id] = _Chat(offset, deque(), time.monotonic())
+
+        return self._chats[chat_id]
+
+    def _evict_idle(self):
+        now = time.monotonic()
+        if not self._idle_timeout or now - self._last_eviction < min(self._idle_timeout, 60):
+            return
+
+        self._last_eviction = now
+        idle = [chat_id for chat_id, chat in self._chats.items() if now - chat.last_access > self._idle_timeout]
+        for chat_id in idle:
+            chat = self._chats.pop(chat_id)
+            if self._spill_dir:
+                self._spill(chat_id, chat.utterances)
+            else:
+                self._evicted[chat_id] = chat.length
+
+        if idle:
+            logger.debug("Evicted %s idle chats", len(idle))
+
+    def _spill_file(self, chat_id: str) -> pathlib.Path:
+        return self._spill_dir / f"{chat_id}.jsonl"
+
+    def _spill(self, chat_id: str, utterances):
+        if not self._spill_dir or not utterances:
+            return
+
+        with open(self._spill_file(chat_id), 'a') as spill_file:
+            for utterance in utterances:
+                spill_file.write(json.dumps(dataclasses.asdict(utterance)) + "\n")
+
+    def _read_spilled(self, chat_id: str) -> List[Utterance]:
+        if not self._spill_dir or not self._spill_file(chat_id).exists():
+            return []
+
+        with open(self._spill_file(chat_id)) as spill_file:
+            return [Utterance(**json.loads(line)) for line in spill_file if line.strip()]
+
+    def _count_spilled(self, chat_id: str) -> int:
+        if not self._spill_dir or not self._spill_file(chat_id).exists():
+            return 0
+
+        with open(self._spill_file(chat_id)) as spill_file:
+            return sum(1 for line in spill_file if line.strip())
@@ -0,0 +1,77 @@
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from typing import Dict, List
+
+IMPORT = "import"
+LOAD = "load"
+START = "start"
+
+PHASES = (IMPORT, LOAD, START)
+
+
+class StartupProfiler:
+    """
+    Collects the time spent per container on importing implementations, loading models and starting services.
+
+    Measurements are exclusive, i.e. the time of a nested measurement is not included in the surrounding one.
+    When the profiler is not enabled, measuring is a no-op.
+    """
+    def __init__(self):
+        self._enabled = False
+        self._timings = defaultdict(lambda: defaultdict(float))
+        self._stack = []
+
+    @property
+    def enabled(self) -> bool:
+        return self._enabled
+
+    def enable(self):
+        self._enabled = True
+
+    @contextmanager
+    def measure(self, container: str, phase: str):
+        if not self._enabled:
+            yield
+            return
+
+        if phase not in PHASES:
+            raise ValueError("Unsupported startup phase: " + phase)
+
+        frame = [0.0]
+        self._stack.append(frame)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self._stack.pop()
+            self._timings[container][phase] += elapsed - frame[0]
+            if self._stack:
+                self._stack[-1][0] += elapsed
+
+    @property
+    def timings(self) -> Dict[str, Dict[str, float]]:
+        return {container: dict(phases) for container, phases in self._timings.items()}
+
+    def report(self) -> str:
+        width = max([len("Container")] + [len(container) for container in self._timings])
+        header = f"{'Container':<{width}}" + "".join(f"{phase:>10}" for phase in PHASES) + f"{'total':>10}"
+
+        lines: List[str] = [header, "-" * len(header)]
+        totals = defaultdict(float)
+        for container, phases in self._timings.items():
+            row = [phases.get(phase, 0.0) for phase in PHASES]
+            for phase, value in zip(PHASES, row):
+                totals[phase] += value
+            lines.append(f"{container:<{width}}" + "".join(f"{value:>10.3f}" for value in row) + f"{sum(row):>10.3f}")
+
+        lines.append("-" * len(header))
+        total_row = [totals[phase] for phase in PHASES]
+        lines.append(f"{'total':<{width}}" + "".join(f"{value:>10.3f}" for value in total_row)
+                     + f"{sum(total_row):>10.3f}")
+
+        return "\n".join(lines)
+
+
+startup_profiler = StartupProfiler()
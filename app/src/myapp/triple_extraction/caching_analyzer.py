@@ -0,0 +1,230 @@
+import argparse
+import logging
+import time
+import weakref
+from typing import List, Optional, Tuple
+
+from cltl.triple_extraction.api import Chat, DialogueAct
+from cltl.triple_extraction.conversational_analyzer import ConversationalAnalyzer
+
+logger = logging.getLogger(__name__)
+
+
+# Number of speaker turns the ConversationalAnalyzer uses as dialogue context. This must match the window
+# `utterances_by_speaker[-3:]` hard-coded in ConversationalAnalyzer._chat_to_converstation.
+CONTEXT_TURNS = 3
+
+
+class _ContextCache:
+    """
+    Tokenization results of the turns in a chat, keyed by the tokenizer and the text.
+
+    Only the entries used for the current and the previous utterance are kept: of the turns in the context of an
+    utterance, only those that were already part of the context of the previous utterance can be reused.
+    """
+    def __init__(self):
+        self.entries = dict()
+        self.previous = dict()
+        self.hits = 0
+        self.misses = 0
+
+    def next_utterance(self):
+        self.previous = self.entries
+        self.entries = dict()
+
+    def get(self, key, compute):
+        if key in self.entries:
+            self.hits += 1
+        elif key in self.previous:
+            self.hits += 1
+            self.entries[key] = self.previous.pop(key)
+        else:
+            self.misses += 1
+            self.entries[key] = compute()
+
+        return self.entries[key]
+
+
+class _CachingNlp:
+    """
+    Wraps the spaCy pipeline of the extractor to parse each turn only once while it is part of the context.
+    """
+    def __init__(self, nlp, analyzer: "CachingConversationalAnalyzer"):
+        self._nlp = nlp
+        self._analyzer = analyzer
+
+    def __call__(self, text, *args, **kwargs):
+        cache = self._analyzer.context_cache
+        if cache is None or args or kwargs:
+            return self._nlp(text, *args, **kwargs)
+
+        return cache.get((id(self._nlp), text), lambda: self._nlp(text))
+
+    def __getattr__(self, name):
+        return getattr(self._nlp, name)
+
+
+class _CachingTokenizer:
+    """
+    Wraps a Hugging Face tokenizer of the extractor to encode each turn, token and candidate only once while it is
+    part of the context.
+    """
+    def __init__(self, tokenizer, analyzer: "CachingConversationalAnalyzer"):
+        self._tokenizer = tokenizer
+        self._analyzer = analyzer
+
+    def encode(self, text, add_special_tokens=True, **kwargs):
+        cache = self._analyzer.context_cache
+        if cache is None or kwargs:
+            return self._tokenizer.encode(text, add_special_tokens=add_special_tokens, **kwargs)
+
+        input_ids = cache.get((id(self._tokenizer), text, add_special_tokens),
+                              lambda: self._tokenizer.encode(text, add_special_tokens=add_special_tokens))
+
+        # Callers may modify the returned list
+        return list(input_ids)
+
+    def __len__(self):
+        return len(self._tokenizer)
+
+    def __getattr__(self, name):
+        return getattr(self._tokenizer, name)
+
+
+class _ChatTail:
+    """
+    View on the last utterances of a chat.
+    """
+    def __init__(self, chat: Chat, utterances: List):
+        self._chat = chat
+        self.utterances = utterances
+
+    def __getattr__(self, name):
+        return getattr(self._chat, name)
+
+
+class CachingConversationalAnalyzer(ConversationalAnalyzer):
+    """
+    ConversationalAnalyzer that caches the tokenization of the dialogue context per chat.
+
+    The analyzer uses the last turns of the chat as context for each new utterance. The spaCy parse and the subword
+    encoding of these turns are cached, so that only the text of the new utterance needs to be processed. The cache
+    only holds the context of the last utterance and is replaced when an utterance of a new chat is analyzed; as the
+    ConversationalAnalyzer keeps a reference to the last chat, it is not released when the scenario stops. The
+    transformer models still encode the full context window, as their token representations depend on the complete
+    input sequence.
+    """
+    def __init__(self, *args, **kwargs):
+        super(CachingConversationalAnalyzer, self).__init__(*args, **kwargs)
+
+        self._cached_chat = None
+        self._chat_cache = _ContextCache()
+        self._context_cache: Optional[_ContextCache] = None
+
+        self._install_caches()
+
+    @property
+    def context_cache(self) -> Optional[_ContextCache]:
+        return self._context_cache
+
+    def analyze_in_context(self, chat):
+        if self._cached_chat is None or self._cached_chat() is not chat:
+            self._cached_chat = weakref.ref(chat)
+            self._chat_cache = _ContextCache()
+
+        self._context_cache = self._chat_cache
+        try:
+            return super(CachingConversationalAnalyzer, self).analyze_in_context(chat)
+        finally:
+            logger.debug("Context cache: %s hits, %s misses",
+                         self._context_cache.hits, self._context_cache.misses)
+            self._context_cache = None
+
+    def _chat_to_converstation(self, chat):
+        # Called once for each utterance from which triples are extracted
+        if self._context_cache is not None:
+            self._context_cache.next_utterance()
+
+        # Only group the utterances of the last turns instead of the complete chat
+        tail = []
+        turns = 0
+        for utterance in reversed(chat.utterances):
+            if not tail or utterance.utterance_speaker != tail[-1].utterance_speaker:
+                turns += 1
+                if turns > CONTEXT_TURNS:
+                    break
+            tail.append(utterance)
+
+        return super(CachingConversationalAnalyzer, self)._chat_to_converstation(_ChatTail(chat, tail[::-1]))
+
+    def _install_caches(self):
+        extractor = getattr(self, "_extractor", None)
+
+        if hasattr(extractor, "_nlp"):
+            extractor._nlp = _CachingNlp(extractor._nlp, self)
+        else:
+            logger.warning("No spaCy pipeline found in %s, turns are parsed for every utterance", extractor)
+
+        for module_name in ("_argument_module", "_scoring_module"):
+            module = getattr(extractor, module_name, None)
+            if hasattr(module, "_tokenizer"):
+                module._tokenizer = _CachingTokenizer(module._tokenizer, self)
+            else:
+                logger.warning("No tokenizer found for %s in %s, turns are encoded for every utterance",
+                               module_name, extractor)
+
+
+def _benchmark(analyzer: ConversationalAnalyzer, turns: List[int], utterances: List[str]) -> List[Tuple[float, int]]:
+    """
+    Run a conversation in which the agent and the human speaker take turns, starting with the agent, and measure the
+    latency of the analyzer for the given (human) turns, together with the number of extracted triples.
+    """
+    chat = Chat("Leolani", "Human")
+    results = []
+    for turn in range(1, max(turns) + 1):
+        speaker = chat.speaker if turn % 2 == 0 else chat.agent
+        chat.add_utterance(utterances[turn % len(utterances)], utterance_speaker=speaker,
+                           dialogue_acts=[DialogueAct.STATEMENT])
+        if speaker != chat.speaker:
+            # As in the TripleExtractionService, triples are only extracted from the utterances of the speaker
+            continue
+
+        start = time.perf_counter()
+        analyzer.analyze_in_context(chat)
+        latency = time.perf_counter() - start
+
+        if turn in turns:
+            results.append((latency, len(chat.last_utterance.triples)))
+
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Compare the per-utterance latency of the ConversationalAnalyzer "
+                                                 "with and without caching of the dialogue context")
+    parser.add_argument("--model_path", type=str, default="resources/conversational_triples")
+    parser.add_argument("--base_model", type=str, default="google-bert/bert-base-multilingual-cased")
+    parser.add_argument("--language", type=str, default="en")
+    parser.add_argument("--turns", type=int, nargs="+", default=[2, 50])
+    parser.add_argument("--repeat", type=int, default=3)
+    args, _ = parser.parse_known_args()
+    args.turns = sorted(set(args.turns))
+    if any(turn < 2 or turn % 2 for turn in args.turns):
+        parser.error(f"Turns must be even, odd turns are agent turns from which no triples are extracted: {args.turns}")
+
+    utterances = ["I like music and my sister plays the piano.", "Do you play an instrument yourself?",
+                  "No, but I listen to jazz every evening.", "Who is your favourite jazz musician?",
+                  "My favourite is Miles Davis, he played the trumpet."]
+
+    for analyzer_class in (ConversationalAnalyzer, CachingConversationalAnalyzer):
+        analyzer = analyzer_class(model_path=args.model_path, base_model=args.base_model, lang=args.language,
+                                  dialogue_acts=[DialogueAct.STATEMENT])
+        runs = [_benchmark(analyzer, args.turns, utterances) for _ in range(args.repeat)]
+        for turn, turn_results in zip(args.turns, zip(*runs)):
+            latency = min(latency for latency, _ in turn_results)
+            triples = turn_results[0][1]
+            print(f"{analyzer_class.__name__:32} turn {turn:4}: {1000 * latency:8.1f} ms, {triples} triples")
+
+
+if __name__ == '__main__':
+    main()
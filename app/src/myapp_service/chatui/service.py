@@ -0,0 +1,80 @@
+import dataclasses
+import json
+import logging
+
+from cltl.combot.infra.config import ConfigurationManager
+from flask import Flask, Response, jsonify, request, stream_with_context
+
+from myapp.chatui.bounded_chats import BoundedChats
+
+logger = logging.getLogger(__name__)
+
+
+class ChatPushService:
+    """
+    Delivers new utterances of a chat to the browser by long-polling or Server-Sent Events (SSE).
+
+    Utterances, including the responses of the agent, are added to the shared chat store by the ChatUI service.
+    """
+    @classmethod
+    def from_config(cls, chats: BoundedChats, config_manager: ConfigurationManager):
+        config = config_manager.get_config("cltl.chat-ui")
+        timeout = config.get_float("long_poll_timeout") if "long_poll_timeout" in config else 30.0
+
+        return cls(chats, timeout)
+
+    def __init__(self, chats: BoundedChats, timeout: float):
+        self._chats = chats
+        self._timeout = timeout
+        self._app = None
+
+    def start(self, timeout=30):
+        pass
+
+    def stop(self):
+        pass
+
+    @property
+    def app(self):
+        """
+        Flask endpoint for REST interface.
+        """
+        if self._app:
+            return self._app
+
+        self._app = Flask(__name__)
+
+        @self._app.route('/<chat_id>/poll', methods=['GET'])
+        def poll(chat_id: str):
+            from_sequence = request.args.get('from', default=0, type=int)
+            timeout = min(request.args.get('timeout', default=self._timeout, type=float), self._timeout)
+
+            sequence, utterances = self._chats.wait_for_utterances(chat_id, from_sequence, timeout=timeout)
+
+            return jsonify({'from': sequence,
+                            'next': sequence + len(utterances),
+                            'utterances': [dataclasses.asdict(utterance) for utterance in utterances]})
+
+        @self._app.route('/<chat_id>/stream', methods=['GET'])
+        def stream(chat_id: str):
+            last_event_id = request.headers.get('Last-Event-ID', default=None, type=int)
+            from_sequence = last_event_id + 1 if last_event_id is not None \
+                else request.args.get('from', default=0, type=int)
+
+            return Response(stream_with_context(self._stream(chat_id, from_sequence)),
+                            mimetype='text/event-stream', headers={'Cache-Control': 'no-cache'})
+
+        return self._app
+
+    def _stream(self, chat_id: str, sequence: int):
+        logger.debug("Started event stream for chat %s from %s", chat_id, sequence)
+        while True:
+            sequence, utterances = self._chats.wait_for_utterances(chat_id, sequence, timeout=self._timeout)
+            if not utterances:
+                # Keep the connection alive and detect closed connections
+                yield ": keep-alive\n\n"
+                continue
+
+            for utterance in utterances:
+                yield f"id: {sequence}\ndata: {json.dumps(dataclasses.asdict(utterance))}\n\n"
+                sequence += 1